@@ -1,5 +1,9 @@
-from protocol import Protocol, Frame, Field, Symbol
+import numpy as np
+from protocol import Protocol, Frame, Field
 from enum import Enum
+from types import MappingProxyType
+
+J1939_FREQUENCY = 250000
 
 class J1939Sof(Field):
         def __init__(self):
@@ -27,40 +31,45 @@ class J1939Ack(Field):
 class J1939Eof(Field):
     def __init__(self):
         super().__init__(name="EOF", length=7)
+def j1939_fields(is_extended: bool = False):
+    """Build the fields of a J1939 frame in transmission order"""
+    return [J1939Sof(), J1939Id(is_extended=is_extended), J1939Control(), J1939Data(), J1939Crc(), J1939Ack(), J1939Eof()]
+
+J1939_TOTAL_BITS = sum(field.length for field in j1939_fields())
+
 class J1939Frame(Frame):
+    _TIME_POINTS = np.arange(J1939_TOTAL_BITS, dtype=np.float32) * np.float32(1.0 / J1939_FREQUENCY)
+    _TIME_POINTS.flags.writeable = False
+
     def __init__(self):
-        fields = [J1939Sof(), J1939Id(is_extended=False), J1939Control(), J1939Data(), J1939Crc(), J1939Ack(), J1939Eof()]
-        super().__init__(fields)
+        super().__init__(j1939_fields(), J1939_FREQUENCY)
         
 class J1939ProbeConfiguration(Enum):
     CAN_H = 0
     CAN_L = 1
     DIFFERENTIAL = 2
 
-class J1939(Protocol):
+J1939_CAN_H_HIGH_LOGIC_VOLTAGE = 3.5
+J1939_CAN_H_LOW_LOGIC_VOLTAGE = 2.5
 
-    def __init__(self, probe_configuration: J1939ProbeConfiguration):
-        J1939_FREQUENCY = 250000
-
-        J1939_CAN_H_HIGH_LOGIC_VOLTAGE = 3.5
-        J1939_CAN_H_LOW_LOGIC_VOLTAGE = 2.5
+J1939_CAN_L_HIGH_LOGIC_VOLTAGE = 2.5
+J1939_CAN_L_LOW_LOGIC_VOLTAGE = 1.5
 
-        J1939_CAN_L_HIGH_LOGIC_VOLTAGE = 2.5
-        J1939_CAN_L_LOW_LOGIC_VOLTAGE = 1.5
+J1939_DIFFERENTIAL_HIGH_LOGIC_VOLTAGE = J1939_CAN_H_HIGH_LOGIC_VOLTAGE - J1939_CAN_L_HIGH_LOGIC_VOLTAGE
+J1939_DIFFERENTIAL_LOW_LOGIC_VOLTAGE = J1939_CAN_H_LOW_LOGIC_VOLTAGE - J1939_CAN_L_LOW_LOGIC_VOLTAGE
 
-        J1939_DIFFERENTIAL_HIGH_LOGIC_VOLTAGE = J1939_CAN_H_HIGH_LOGIC_VOLTAGE - J1939_CAN_L_HIGH_LOGIC_VOLTAGE
-        J1939_DIFFERENTIAL_LOW_LOGIC_VOLTAGE = J1939_CAN_H_LOW_LOGIC_VOLTAGE - J1939_CAN_L_LOW_LOGIC_VOLTAGE
+class J1939(Protocol):
+    # (high, low) logic voltages seen by each probe configuration
+    _PROBE_VOLTAGES = MappingProxyType({
+        J1939ProbeConfiguration.CAN_H: (J1939_CAN_H_HIGH_LOGIC_VOLTAGE, J1939_CAN_H_LOW_LOGIC_VOLTAGE),
+        J1939ProbeConfiguration.CAN_L: (J1939_CAN_L_HIGH_LOGIC_VOLTAGE, J1939_CAN_L_LOW_LOGIC_VOLTAGE),
+        J1939ProbeConfiguration.DIFFERENTIAL: (J1939_DIFFERENTIAL_HIGH_LOGIC_VOLTAGE, J1939_DIFFERENTIAL_LOW_LOGIC_VOLTAGE),
+    })
 
-        if probe_configuration == J1939ProbeConfiguration.CAN_H:
-            high_logic_voltage = J1939_CAN_H_HIGH_LOGIC_VOLTAGE
-            low_logic_voltage = J1939_CAN_H_LOW_LOGIC_VOLTAGE
-        elif probe_configuration == J1939ProbeConfiguration.CAN_L:
-            high_logic_voltage = J1939_CAN_L_HIGH_LOGIC_VOLTAGE
-            low_logic_voltage = J1939_CAN_L_LOW_LOGIC_VOLTAGE
-        elif probe_configuration == J1939ProbeConfiguration.DIFFERENTIAL:
-            high_logic_voltage = J1939_DIFFERENTIAL_HIGH_LOGIC_VOLTAGE
-            low_logic_voltage = J1939_DIFFERENTIAL_LOW_LOGIC_VOLTAGE
-        else:
-            raise ValueError("Invalid probe configuration")
+    def __init__(self, probe_configuration: J1939ProbeConfiguration):
+        try:
+            high_logic_voltage, low_logic_voltage = self._PROBE_VOLTAGES[probe_configuration]
+        except (KeyError, TypeError): # TypeError: unhashable arguments
+            raise ValueError("Invalid probe configuration") from None
 
         super().__init__(J1939_FREQUENCY, high_logic_voltage, low_logic_voltage, J1939Frame())
\ No newline at end of file
@@ -0,0 +1,61 @@
+import functools
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError: # numba is optional; callers fall back to NumPy
+    njit = None
+
+# Logic level -> voltage mapping shared by the generated functions below.
+# They emit float32 samples: plenty for plotting, and half the bytes handed to matplotlib
+_VOLTAGE_EXPR = "np.float32({v_lo!r}) + {levels} * np.float32({v_span!r})"
+
+# Fused single-pass loop that builds its own time axis; only worth it once numba compiles it
+_JIT_SOURCE = """
+def generate(levels, time_points):
+    time_points = np.empty({n}, dtype=np.float32)
+    voltage_points = np.empty({n}, dtype=np.float32)
+    for i in range({n}):
+        time_points[i] = i * np.float32({duration!r})
+        voltage_points[i] = {voltage}
+    return time_points, voltage_points
+"""
+
+# Vectorized fallback reusing the frame's precomputed time axis
+_NUMPY_SOURCE = """
+def generate(levels, time_points):
+    return time_points, {voltage}
+"""
+
+def _compile(source: str, name: str, filename: str):
+    """exec generated source and return the function it defines under `name`"""
+    namespace = {"np": np}
+    exec(compile(source, filename, "exec"), namespace)
+    return namespace[name]
+
+@functools.lru_cache(maxsize=None)
+def specialize(n: int, duration: float, v_hi: float, v_lo: float):
+    """Compile a waveform generator with a fixed frame layout and voltages baked in as constants
+
+    Generators are memoized, so protocols with equal layouts and voltages share one compiled function.
+    """
+    if njit is not None:
+        voltage = _VOLTAGE_EXPR.format(levels="levels[i]", v_lo=float(v_lo), v_span=float(v_hi - v_lo))
+        source = _JIT_SOURCE.format(n=n, duration=float(duration), voltage=voltage)
+    else:
+        voltage = _VOLTAGE_EXPR.format(levels="levels.astype(np.float32)", v_lo=float(v_lo), v_span=float(v_hi - v_lo))
+        source = _NUMPY_SOURCE.format(voltage=voltage)
+
+    generate = _compile(source, "generate", f"<waveform generator n={n}>")
+    if njit is not None:
+        generate = njit(cache=False, fastmath=True)(generate)
+    return generate
+
+def voltage_mapper(v_hi: float, v_lo: float):
+    """Build the float32 logic level -> voltage mapping for level arrays of any shape"""
+    v_lo32 = np.float32(v_lo)
+    v_span32 = np.float32(v_hi - v_lo)
+
+    def to_voltages(levels: np.ndarray) -> np.ndarray:
+        return v_lo32 + np.asarray(levels, dtype=np.float32) * v_span32
+    return to_voltages
@@ -1,71 +1,173 @@
+import functools
+import math
 import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.lines import Line2D
+from matplotlib.ticker import FuncFormatter
 from abc import ABC, abstractmethod, abstractproperty
 from dataclasses import dataclass
 from typing import List, Tuple, Optional, Dict
 
-@dataclass
-class Symbol:
-    """Represents a single symbol in the protocol (logic level and duration)"""
-    logic_level: float
-    duration: float
+from _waveform_kernel import specialize, voltage_mapper
 
 @dataclass
 class Field:
     """Represents a field in the protocol frame (e.g., ID, Data, CRC)"""
     name: str
     length: int
-    symbols: List[Symbol]
 
-    def __init__(self, name: str, length: int, symbols: List[Symbol]=None):
+    def __init__(self, name: str, length: int):
         self.name = name
         self.length = length
-        if symbols is None:
-            self.symbols = [Symbol(0, 0) for _ in range(length)]
-        else:
-            self.symbols = symbols
+        # Until the field is attached to a Frame it owns its own level array
+        self.logic_levels = np.zeros(length, dtype=np.int8)
 
-    def parse_as_string(self, data: str, frame_start: int = 0) -> List[Symbol]:
-        """Parse the user data from the input string into the frame"""
-        start_index = frame_start // 4 # each char is 4 bits
-        num_chars = self.length // 4 # each char is 4 bits
+    def _attach(self, levels: np.ndarray):
+        """Move the field's bits into its slice of the frame's level array"""
+        levels[:] = self.logic_levels
+        self.logic_levels = levels
 
-        if num_chars == 0:
-            num_chars = 1
-        data = data[frame_start:frame_start+num_chars]
-        data_int = int(data, 16)
+    @property
+    def symbols(self) -> np.ndarray:
+        """The field's symbols, as a view of its logic levels"""
+        return self.logic_levels
 
-        self.parse_as_decimal(data_int)
+    def parse_as_string(self, data: str) -> None:
+        """Parse the field's value from a hex string"""
+        self.parse_as_int(int(data, 16))
+
+    def parse_user_data(self, bits: np.ndarray, bit_offset: int = 0) -> None:
+        """Copy the field's bits out of an unpacked frame bit array"""
+        self.logic_levels[:] = bits[bit_offset:bit_offset+self.length]
     
-    def parse_as_decimal(self, data: int) -> List[Symbol]:
-        """Parse the user data from the input string into the frame"""
-        for i in range(self.length):
-            bit_value = (data >> i) & 1
-            self.symbols[self.length - i - 1].logic_level = bit_value
+    def parse_as_int(self, data: int) -> None:
+        """Write an integer into the field's bits, MSB first"""
+        if not 0 <= data < (1 << self.length):
+            raise ValueError(f"{self.name} value {data} does not fit in {self.length} bits")
+        bits = np.unpackbits(np.array([data], dtype='>u8').view(np.uint8))
+        self.logic_levels[:] = bits[-self.length:]
 
 class Frame:
     """Represents a complete protocol frame"""
-    def __init__(self, fields: List[Field]):
+    # Frames with a fixed layout can precompute their time axis once at class level; it is only used if its size matches the fields
+    _TIME_POINTS: Optional[np.ndarray] = None
+
+    def __init__(self, fields: List[Field], frequency: float):
         self.fields = fields
+        self.bit_period = 1.0 / frequency
+
+        # The frame keeps its bits in one level array; each field writes into its own slice
+        total_bits = sum(field.length for field in fields)
+        self._levels = np.zeros(total_bits, dtype=np.int8)
+        if self._TIME_POINTS is not None and self._TIME_POINTS.size == total_bits:
+            self._time_points = self._TIME_POINTS
+        else:
+            self._time_points = np.arange(total_bits, dtype=np.float32) * np.float32(self.bit_period)
+
+        offset = 0
+        for field in fields:
+            field._attach(self._levels[offset:offset + field.length])
+            offset += field.length
     
-    def get_all_symbols(self) -> List[Symbol]:
-        """Get all symbols in the frame in order"""
-        symbols = []
-        for field in self.fields:
-            symbols.extend(field.symbols)
-        return symbols
+    def get_all_symbols(self) -> np.ndarray:
+        """Get all symbols in the frame in order, as a view of its logic levels"""
+        return self._levels
     
-    @abstractmethod
-    def parse_user_data(self, data: str) -> List[Symbol]:
+    def parse_user_data(self, data: str) -> None:
         """Parse the user data from the input string into the frame"""
+        bits = self.unpack_frames([data])[0]
+
         frame_start = 0
         for field in self.fields:
-            field.parse_as_string(data, frame_start)
+            field.parse_user_data(bits, frame_start)
             frame_start += field.length
 
+    def unpack_frames(self, data: List[str]) -> np.ndarray:
+        """Unpack hex strings into a (frames, bits) array without touching the frame's own bits"""
+        total_bits = self._levels.size
+        frame_bytes = (total_bits + 7) // 8
+
+        raw = []
+        for frame_data in data:
+            frame_data = "".join(frame_data.split()) # captures may separate bytes with whitespace
+            if len(frame_data) * 4 < total_bits: # check before padding, so padding never supplies real bits
+                raise ValueError(f"Expected at least {total_bits} bits of data, got {len(frame_data) * 4}")
+            if len(frame_data) % 2:
+                frame_data += "0" # bytes.fromhex needs whole bytes
+            frame_raw = bytes.fromhex(frame_data)
+            raw.append(frame_raw[:frame_bytes])
+
+        buf = np.frombuffer(b"".join(raw), dtype=np.uint8).reshape(len(data), frame_bytes)
+        return np.unpackbits(buf, axis=1, bitorder='big')[:, :total_bits]
+
+# Tick formatters keyed by the power of ten (in steps of three) of the waveform's length
+_FORMATTERS = {
+    -9: FuncFormatter(lambda x, p: f'{x*1e9:.0f}ns'),
+    -6: FuncFormatter(lambda x, p: f'{x*1e6:.0f}µs'),
+    -3: FuncFormatter(lambda x, p: f'{x*1e3:.0f}ms'),
+    0: FuncFormatter(lambda x, p: f'{x:.3f}s'),
+}
+
+# Figure reused across Waveform.plot calls
+_FIG, _AX, _LINE = None, None, None
+
+def get_time_formatter(max_time):
+    """Returns a formatter based on the maximum time value"""
+    if max_time <= 0:
+        return _FORMATTERS[-9]
+    bucket = 3 * (math.floor(math.log10(max_time)) // 3)
+    return _FORMATTERS[min(0, max(-9, bucket))]
+
 class Waveform:
-    def __init__(self, time_points: List[float], voltage_points: List[float]):
+    """Time and voltage samples of a single frame"""
+    def __init__(self, time_points: np.ndarray, voltage_points: np.ndarray, bit_period: float):
         self.time_points = time_points
         self.voltage_points = voltage_points
+        self.bit_period = bit_period
+
+    def draw(self, ax: plt.Axes, line: Optional[Line2D] = None) -> Line2D:
+        """Draw the waveform onto ax as a step line, or redraw an existing line with it"""
+        # Time points are monotone, so the waveform ends after the last symbol
+        max_time = self.time_points[-1] + self.bit_period
+
+        # Repeat the last level at the end time so steps-post draws the final symbol
+        time_points = np.append(self.time_points, max_time)
+        voltage_points = np.append(self.voltage_points, self.voltage_points[-1])
+
+        if line is None:
+            line, = ax.plot(time_points, voltage_points, 'b-', drawstyle='steps-post', linewidth=2)
+        else:
+            line.set_data(time_points, voltage_points)
+            ax.relim()
+            ax.autoscale_view()
+
+        # Format time axis to use appropriate units
+        ax.xaxis.set_major_formatter(get_time_formatter(max_time))
+        return line
+
+    def plot(self, title: str = "Protocol Waveform"):
+        """Plot the waveform using matplotlib"""
+        global _FIG, _AX, _LINE
+        if _LINE is None or not plt.fignum_exists(_FIG.number):
+            # First plot, or the previous window was closed
+            fig, ax = plt.subplots(figsize=(12, 6))
+            try:
+                line = self.draw(ax)
+            except Exception:
+                plt.close(fig)
+                raise
+            ax.grid(True)
+            ax.set_xlabel('Time (s)')
+            ax.set_ylabel('Voltage (V)')
+            # Only remember the figure once it is complete
+            _FIG, _AX, _LINE = fig, ax, line
+        else:
+            # Redraw into the existing figure instead of allocating a new one
+            self.draw(_AX, _LINE)
+        _AX.set_title(title)
+        _FIG.canvas.draw_idle()
+            
+        plt.show()
 
 class Protocol(ABC):
     def __init__(self, frequency: float, high_logic_voltage: float, low_logic_voltage: float, data_frame: Frame):
@@ -73,31 +175,55 @@ class Protocol(ABC):
         self.period = 1.0 / frequency
         self.high_logic_voltage = high_logic_voltage
         self.low_logic_voltage = low_logic_voltage
+        self._to_voltages = voltage_mapper(high_logic_voltage, low_logic_voltage)
         self.data_frame = data_frame
 
+        # The frame layout and voltages are fixed from here on, so build a generator specialized on them
+        self._generate = specialize(data_frame._levels.size, data_frame.bit_period, high_logic_voltage, low_logic_voltage)
+
+        # Per-instance memo of parsed input strings, so the cache dies with the protocol
+        self._parse_cached = functools.lru_cache(maxsize=256)(self._parse_uncached)
+
     def logic_to_voltage(self, logic_level: int) -> float:
         """Convert a logical level (0 or 1) to the corresponding voltage"""
-        if logic_level == 1:
-            return self.high_logic_voltage
-        else:
-            return self.low_logic_voltage
+        return self.low_logic_voltage + logic_level * (self.high_logic_voltage - self.low_logic_voltage)
     
-    def generate_waveform(self, data: str) -> Waveform:
+    def generate_waveform(self, data: Optional[str] = None) -> Waveform:
         """Generate the complete waveform from the frame"""
-        # Create the frame
         frame = self.data_frame
-        
-        # Get all symbols
-        symbols = frame.get_all_symbols()
-        
-        # Generate time and voltage arrays
-        time_points = []
-        voltage_points = []
-        current_time = 0.0
-        
-        for symbol in symbols:
-            time_points.append(current_time)
-            voltage_points.append(self.logic_to_voltage(symbol.logic_level))
-            current_time += symbol.duration
-            
-        return Waveform(time_points, voltage_points)
\ No newline at end of file
+
+        # Fill the frame from the cache, or reuse the bits already entered into its fields
+        if data is not None:
+            levels, time_points, voltage_points = self._parse_cached(data)
+            frame._levels[:] = levels
+        else:
+            time_points, voltage_points = self._generate(frame._levels, frame._time_points)
+
+        return Waveform(time_points, voltage_points, frame.bit_period)
+
+    def _parse_uncached(self, data: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Parse a hex string and build its waveform; memoized per instance as _parse_cached"""
+        levels = self.data_frame.unpack_frames([data])[0].astype(np.int8)
+        time_points, voltage_points = self._generate(levels, self.data_frame._time_points)
+
+        # The arrays are shared between callers, so freeze them; the NumPy path hands back
+        # the frame's own time axis, which is not ours to freeze
+        frozen = (levels, voltage_points) if time_points is self.data_frame._time_points else (levels, time_points, voltage_points)
+        for array in frozen:
+            array.flags.writeable = False
+        return levels, time_points, voltage_points
+
+    def generate_waveforms(self, data: List[str]) -> List[Waveform]:
+        """Generate the waveforms of many frames at once, without changing the frame's bits"""
+        frame = self.data_frame
+        bits = frame.unpack_frames(data)
+
+        # Voltages for every frame are computed in one (frames, bits) array
+        voltage_points = self._to_voltages(bits)
+
+        # Each waveform is a row view of that array and shares the frame's time axis
+        return [Waveform(frame._time_points, row, frame.bit_period) for row in voltage_points]
+
+    def plot(self, data: Optional[str] = None, ax: Optional[plt.Axes] = None) -> Line2D:
+        """Draw the frame's waveform onto an Axes (the current one by default)"""
+        return self.generate_waveform(data).draw(ax if ax is not None else plt.gca())
\ No newline at end of file